@@ -1 +1,13 @@
-# AgentState 定义
\ No newline at end of file
+# AgentState 定义
+
+# src/core/state.py
+from typing import Any, Dict, List, Optional, TypedDict
+
+class AgentState(TypedDict, total=False):
+    """工作流在节点间传递的状态"""
+    
+    # 路由节点写入: 当前执行的代理，以及需要并发执行的全部代理 (选中多个时)
+    current_agent: Optional[str]
+    selected_agents: List[str]
+    # 并行执行节点写入: 代理名 -> 执行结果
+    agent_results: Dict[str, Any]
@@ -5,7 +5,7 @@
 from langgraph.graph import StateGraph, END
 from src.graph.nodes import (
     PreprocessNode, RoutingNode, 
-    AgentExecutionNode, ToolCallingNode
+    AgentExecutionNode, AsyncAgentExecutionNode, ToolCallingNode
 )
 from src.core.state import AgentState
 
@@ -22,7 +22,8 @@ class WorkflowBuilder:
         self.nodes = {
             "preprocess": PreprocessNode(),
             "router": RoutingNode(),
-            "agent_executor": AgentExecutionNode(),
+            # 包装单代理执行节点，多个代理被选中时并发执行
+            "async_agent_executor": AsyncAgentExecutionNode(AgentExecutionNode()),
             "tool_caller": ToolCallingNode()
         }
         
@@ -40,8 +41,15 @@ class WorkflowBuilder:
         self.graph.add_conditional_edges(
             "router",
             self._route_to_agent,
-            {agent: "agent_executor" for agent in self.settings.enabled_agents}
+            {agent: "async_agent_executor" for agent in self.settings.enabled_agents}
         )
         
-        self.graph.add_edge("agent_executor", END)
-        return self.graph.compile()
\ No newline at end of file
+        self.graph.add_edge("async_agent_executor", END)
+        return self.graph.compile()
+    
+    def close(self):
+        """释放节点持有的资源 (如执行节点的线程池)"""
+        for node in self.nodes.values():
+            close = getattr(node, "close", None)
+            if close is not None:
+                close()
\ No newline at end of file
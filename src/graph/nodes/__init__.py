@@ -0,0 +1,7 @@
+# graph/nodes/__init__.py
+"""
+LangGraph 节点定义
+"""
+from .agent_execution import AsyncAgentExecutionNode
+
+__all__ = ['AsyncAgentExecutionNode']
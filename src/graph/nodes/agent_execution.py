@@ -0,0 +1,67 @@
+# 代理执行节点
+
+# graph/nodes/agent_execution.py
+"""
+代理执行节点 - 支持将路由选出的多个代理并发执行
+"""
+import asyncio
+import inspect
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+class AsyncAgentExecutionNode:
+    """
+    并行代理执行节点
+    
+    读取路由节点写入状态的 selected_agents (未写入时退回 current_agent)，
+    多个代理被选中时并发执行，结果按代理名写入 agent_results。
+    """
+    
+    def __init__(self, executor: Callable, max_workers: Optional[int] = None):
+        """
+        Args:
+            executor: 单个代理的执行节点 (同步或异步可调用对象)
+            max_workers: 同步执行节点使用的线程数，默认为CPU核数
+        """
+        self.executor = executor
+        self._is_async = (
+            inspect.iscoroutinefunction(executor)
+            or inspect.iscoroutinefunction(getattr(executor, "__call__", None))
+        )
+        # 只有同步执行节点需要线程池
+        self._pool = (
+            None if self._is_async
+            else ThreadPoolExecutor(max_workers=max_workers or os.cpu_count())
+        )
+    
+    async def __call__(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """执行路由选出的代理"""
+        agents: List[str] = state.get("selected_agents") or (
+            [state["current_agent"]] if state.get("current_agent") else []
+        )
+        if not agents:
+            raise ValueError("状态中没有路由选出的代理 (selected_agents/current_agent)")
+        
+        # 只选中一个代理时保持原有的单代理执行语义
+        if len(agents) == 1:
+            return await self._run(agents[0], state)
+        
+        results = await asyncio.gather(*(self._run(agent, state) for agent in agents))
+        return {"agent_results": dict(zip(agents, results))}
+    
+    async def _run(self, agent: str, state: Dict[str, Any]) -> Any:
+        """执行单个代理，同步执行节点放到线程池中避免阻塞事件循环"""
+        agent_state = {**state, "current_agent": agent}
+        
+        if self._is_async:
+            return await self.executor(agent_state)
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, self.executor, agent_state)
+    
+    def close(self):
+        """关闭线程池 (由持有工作流的一方在停止时调用)"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
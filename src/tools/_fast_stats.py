@@ -0,0 +1,50 @@
+# tools/_fast_stats.py
+"""
+数值统计内核 - 大数据量时绕过pandas逐列分派，直接对二维数组做向量化计算
+"""
+import numpy as np
+
+# compute_summary 输出的统计量顺序
+SUMMARY_KEYS = ("mean", "median", "std", "min", "max", "q1", "q3")
+
+def _quantile_bounds(n: int, q: float):
+    """线性插值分位数所需的下标与权重 (与pandas默认算法一致)"""
+    pos = (n - 1) * q
+    lo = int(np.floor(pos))
+    hi = min(lo + 1, n - 1)
+    return lo, hi, pos - lo
+
+def compute_summary(arr: np.ndarray) -> np.ndarray:
+    """
+    按列计算统计量 (输入为不含NaN的二维float64数组)
+    
+    Returns:
+        形状为 (7, 列数) 的数组，行顺序见 SUMMARY_KEYS
+    """
+    n_rows, n_cols = arr.shape
+    out = np.empty((7, n_cols))
+    
+    out[0] = arr.mean(axis=0)
+    out[2] = arr.std(axis=0, ddof=1) if n_rows > 1 else np.nan
+    out[3] = arr.min(axis=0)
+    out[4] = arr.max(axis=0)
+    
+    # 只把分位数用到的位置放到正确位置，无需完整排序
+    bounds = [_quantile_bounds(n_rows, q) for q in (0.25, 0.5, 0.75)]
+    kth = sorted({i for lo, hi, _ in bounds for i in (lo, hi)})
+    part = np.partition(arr, kth, axis=0)
+    for row, (lo, hi, frac) in zip((5, 1, 6), bounds):
+        out[row] = part[lo] + (part[hi] - part[lo]) * frac
+    
+    return out
+
+def compute_correlation(arr: np.ndarray) -> np.ndarray:
+    """皮尔逊相关系数矩阵 (输入为不含NaN的二维float64数组)，标准化后走BLAS矩阵乘"""
+    n_rows = arr.shape[0]
+    std = arr.std(axis=0, ddof=1)
+    std[std == 0] = np.nan  # 常数列的相关系数与pandas一致为NaN
+    
+    z = (arr - arr.mean(axis=0)) / std
+    corr = np.clip((z.T @ z) / (n_rows - 1), -1.0, 1.0)
+    np.fill_diagonal(corr, np.where(np.isnan(std), np.nan, 1.0))
+    return corr
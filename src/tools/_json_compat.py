@@ -0,0 +1,37 @@
+# tools/_json_compat.py
+"""
+JSON编解码 - 优先使用orjson，超出64位的整数回退到标准库json
+orjson 会把超出64位范围的整数解析为float (丢失精度)，序列化时则直接报错
+"""
+import json
+import re
+from typing import Any, Union
+
+import orjson
+
+# 19位及以上的数字串可能超出 int64/uint64 范围 (也可能只是字符串中的数字，回退只是变慢)
+_LONG_DIGITS = re.compile(r"\d{19,}")
+_LONG_DIGITS_BYTES = re.compile(rb"\d{19,}")
+
+def loads(data: Union[str, bytes]) -> Any:
+    """解析JSON，保证大整数不丢失精度 (解析失败时抛出 json.JSONDecodeError)"""
+    # 是否合法一律由orjson判定 (NaN/Infinity、溢出为无穷的浮点数、孤立代理项均被拒绝)，
+    # 标准库json只用于在含长数字串时还原精确的大整数，两条路径接受的语法因此一致
+    result = orjson.loads(data)
+    pattern = _LONG_DIGITS if isinstance(data, str) else _LONG_DIGITS_BYTES
+    if pattern.search(data) is None:
+        return result
+    return json.loads(data)
+
+def dumps(obj: Any, indent: bool = False) -> str:
+    """序列化为JSON字符串，indent 为 True 时缩进2个空格"""
+    try:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+    except orjson.JSONEncodeError:
+        # 与orjson输出格式保持一致: 不转义非ASCII字符，紧凑模式无多余空格
+        return json.dumps(
+            obj,
+            ensure_ascii=False,
+            indent=2 if indent else None,
+            separators=(",", ": ") if indent else (",", ":")
+        )
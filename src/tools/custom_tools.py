@@ -5,11 +5,19 @@
 自定义工具 - 业务特定工具示例
 """
 import asyncio
+import os
 import random
-from datetime import datetime, timedelta
+import re
+import secrets
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Any, Optional
 from registry import BaseTool, ToolMetadata, ToolParameter, tool_decorator
 
+# 禁止出现在文件路径中的片段
+_FORBIDDEN_PATH_PATTERN = re.compile(
+    "|".join(map(re.escape, ['..', '~', '/etc/', '/var/', 'C:\\Windows']))
+)
+
 class FileReaderTool(BaseTool):
     """文件读取工具 (示例)"""
     
@@ -46,6 +54,7 @@ class FileReaderTool(BaseTool):
         )
         super().__init__(metadata)
         self.allowed_extensions = allowed_extensions or ['.txt', '.md', '.json', '.csv', '.py']
+        self._allowed_ext_tuple = tuple(self.allowed_extensions)
     
     async def execute(self, **kwargs) -> Dict[str, Any]:
         """读取文件"""
@@ -58,19 +67,17 @@ class FileReaderTool(BaseTool):
             return {"error": "不允许的文件路径"}
         
         # 检查文件扩展名
-        if not any(file_path.endswith(ext) for ext in self.allowed_extensions):
+        if not file_path.endswith(self._allowed_ext_tuple):
             return {"error": f"不支持的文件类型，允许的类型: {self.allowed_extensions}"}
         
         try:
-            # 检查文件大小
-            import os
-            file_size = os.path.getsize(file_path)
+            # 检查文件大小 (阻塞I/O放到线程中执行，避免阻塞事件循环)
+            file_size = await asyncio.to_thread(os.path.getsize, file_path)
             if file_size > max_size_mb * 1024 * 1024:
                 return {"error": f"文件过大，限制为 {max_size_mb}MB"}
             
             # 读取文件
-            with open(file_path, 'r', encoding=encoding) as f:
-                content = f.read()
+            content = await asyncio.to_thread(self._read_file, file_path, encoding)
             
             return {
                 "file_path": file_path,
@@ -84,12 +91,19 @@ class FileReaderTool(BaseTool):
         except Exception as e:
             return {"error": f"读取文件失败: {str(e)}"}
     
+    @staticmethod
+    def _read_file(file_path: str, encoding: str) -> str:
+        """同步读取文件内容"""
+        with open(file_path, 'r', encoding=encoding) as f:
+            return f.read()
+    
     def _is_safe_path(self, file_path: str) -> bool:
         """检查文件路径是否安全"""
         # 实现路径安全检查
         # 这里简化处理，实际应根据业务需求实现
-        forbidden_patterns = ['..', '~', '/etc/', '/var/', 'C:\\Windows']
-        return not any(pattern in file_path for pattern in forbidden_patterns)
+        return _FORBIDDEN_PATH_PATTERN.search(file_path) is None
+
+_WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
 
 class TimeSensitiveTool(BaseTool):
     """时间敏感工具示例"""
@@ -137,11 +151,11 @@ class TimeSensitiveTool(BaseTool):
         operation = kwargs["operation"]
         
         if operation == "now":
-            now = datetime.now()
+            now = datetime.now(timezone.utc)
             return {
                 "timestamp": now.isoformat(),
                 "formatted": now.strftime(kwargs.get("format", "%Y-%m-%d %H:%M:%S")),
-                "timezone": "UTC"  # 实际应获取时区
+                "timezone": "UTC"
             }
         
         elif operation == "format":
@@ -162,20 +176,41 @@ class TimeSensitiveTool(BaseTool):
         
         elif operation == "calculate":
             delta_days = kwargs.get("delta_days", 0)
-            base_date = datetime.now()
+            base_date = datetime.now(timezone.utc)
             target_date = base_date + timedelta(days=delta_days)
             
             return {
                 "base_date": base_date.isoformat(),
                 "target_date": target_date.isoformat(),
                 "delta_days": delta_days,
-                "day_of_week": target_date.strftime("%A"),
+                "day_of_week": _WEEKDAYS[target_date.weekday()],
                 "is_future": delta_days > 0
             }
         
         else:
             return {"error": f"不支持的操作: {operation}"}
 
+# 密码字符集
+_LOWERCASE = 'abcdefghijklmnopqrstuvwxyz'
+_UPPERCASE = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+_NUMBERS = '0123456789'
+_SYMBOLS = '!@#$%^&*()_+-=[]{}|;:,.<>?'
+
+# 密码强度评分 (0-4) -> 强度等级
+_STRENGTH_TBL = ("弱", "弱", "中", "强", "强")
+
+_system_random = secrets.SystemRandom()
+
+def _random_chars(alphabet: str, count: int) -> List[str]:
+    """从字符集中批量抽取随机字符 (拒绝采样以避免取模偏差)"""
+    n = len(alphabet)
+    limit = 256 - 256 % n
+    chars = []
+    while len(chars) < count:
+        raw = secrets.token_bytes(count - len(chars) + 16)
+        chars.extend(alphabet[b % n] for b in raw if b < limit)
+    return chars[:count]
+
 # 业务特定工具示例
 @tool_decorator(
     name="generate_password",
@@ -188,10 +223,10 @@ async def generate_password(
     use_symbols: bool = True
 ) -> Dict[str, Any]:
     """生成安全随机密码"""
-    lowercase = 'abcdefghijklmnopqrstuvwxyz'
-    uppercase = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ' if use_uppercase else ''
-    numbers = '0123456789' if use_numbers else ''
-    symbols = '!@#$%^&*()_+-=[]{}|;:,.<>?' if use_symbols else ''
+    lowercase = _LOWERCASE
+    uppercase = _UPPERCASE if use_uppercase else ''
+    numbers = _NUMBERS if use_numbers else ''
+    symbols = _SYMBOLS if use_symbols else ''
     
     all_chars = lowercase + uppercase + numbers + symbols
     
@@ -202,40 +237,23 @@ async def generate_password(
         return {"error": "密码长度至少为4位"}
     
     # 确保每种类型至少有一个字符
-    password_chars = []
-    if lowercase:
-        password_chars.append(random.choice(lowercase))
-    if uppercase:
-        password_chars.append(random.choice(uppercase))
-    if numbers:
-        password_chars.append(random.choice(numbers))
-    if symbols:
-        password_chars.append(random.choice(symbols))
+    password_chars = [
+        secrets.choice(chars)
+        for chars in (lowercase, uppercase, numbers, symbols)
+        if chars
+    ]
     
-    # 填充剩余长度
+    # 填充剩余长度 (一次性获取随机字节)
     remaining = length - len(password_chars)
-    password_chars.extend(random.choice(all_chars) for _ in range(remaining))
+    password_chars.extend(_random_chars(all_chars, remaining))
     
     # 随机打乱
-    random.shuffle(password_chars)
+    _system_random.shuffle(password_chars)
     password = ''.join(password_chars)
     
     # 评估密码强度
-    strength = "弱"
-    score = 0
-    if length >= 12:
-        score += 1
-    if use_uppercase:
-        score += 1
-    if use_numbers:
-        score += 1
-    if use_symbols:
-        score += 1
-    
-    if score >= 3:
-        strength = "强"
-    elif score >= 2:
-        strength = "中"
+    score = (length >= 12) + bool(use_uppercase) + bool(use_numbers) + bool(use_symbols)
+    strength = _STRENGTH_TBL[score]
     
     return {
         "password": password,
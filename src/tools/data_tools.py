@@ -9,12 +9,162 @@ import numpy as np
 import json
 import csv
 import math
+import operator
+from collections import ChainMap
+from functools import lru_cache
 from io import StringIO
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Union, Callable, FrozenSet, Mapping, Tuple
 from datetime import datetime
 from registry import BaseTool, ToolMetadata, ToolParameter, tool_decorator
+from _fast_stats import SUMMARY_KEYS, compute_summary, compute_correlation
+import _json_compat
 import ast
 
+# 数值单元格数超过该值时走NumPy快速路径 (小数据两者差异可忽略)
+_FAST_PATH_MIN_CELLS = 10_000
+
+# 表达式求值函数: 接收命名空间，返回计算结果
+_Evaluator = Callable[[Mapping[str, Any]], Any]
+
+_BIN_OPS = {
+    ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul,
+    ast.Div: operator.truediv, ast.FloorDiv: operator.floordiv, ast.Mod: operator.mod,
+    ast.Pow: operator.pow, ast.MatMult: operator.matmul,
+    ast.LShift: operator.lshift, ast.RShift: operator.rshift,
+    ast.BitAnd: operator.and_, ast.BitOr: operator.or_, ast.BitXor: operator.xor
+}
+
+_UNARY_OPS = {
+    ast.UAdd: operator.pos, ast.USub: operator.neg,
+    ast.Not: operator.not_, ast.Invert: operator.invert
+}
+
+_CMP_OPS = {
+    ast.Eq: operator.eq, ast.NotEq: operator.ne,
+    ast.Lt: operator.lt, ast.LtE: operator.le,
+    ast.Gt: operator.gt, ast.GtE: operator.ge,
+    ast.Is: operator.is_, ast.IsNot: operator.is_not,
+    ast.In: lambda a, b: a in b, ast.NotIn: lambda a, b: a not in b
+}
+
+def _compile_node(node: ast.AST) -> _Evaluator:
+    """将AST节点转换为闭包，执行时不再经过 compile/eval"""
+    if isinstance(node, ast.Constant):
+        value = node.value
+        return lambda env: value
+    
+    if isinstance(node, ast.Name):
+        name = node.id
+        def load(env):
+            try:
+                return env[name]
+            except KeyError:
+                raise NameError(f"name '{name}' is not defined") from None
+        return load
+    
+    if isinstance(node, ast.BinOp) and type(node.op) in _BIN_OPS:
+        op = _BIN_OPS[type(node.op)]
+        left, right = _compile_node(node.left), _compile_node(node.right)
+        return lambda env: op(left(env), right(env))
+    
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPS:
+        op = _UNARY_OPS[type(node.op)]
+        operand = _compile_node(node.operand)
+        return lambda env: op(operand(env))
+    
+    if isinstance(node, ast.BoolOp):
+        values = [_compile_node(v) for v in node.values]
+        is_and = isinstance(node.op, ast.And)
+        def bool_op(env):
+            for value in values:
+                result = value(env)
+                if bool(result) != is_and:
+                    return result
+            return result
+        return bool_op
+    
+    if isinstance(node, ast.Compare):
+        first = _compile_node(node.left)
+        pairs = [(_CMP_OPS[type(op)], _compile_node(c)) for op, c in zip(node.ops, node.comparators)]
+        def compare(env):
+            left = first(env)
+            for op, right in pairs:
+                right_value = right(env)
+                result = op(left, right_value)
+                if not result:
+                    return result
+                left = right_value
+            return result
+        return compare
+    
+    if isinstance(node, ast.IfExp):
+        test, body, orelse = (_compile_node(n) for n in (node.test, node.body, node.orelse))
+        return lambda env: body(env) if test(env) else orelse(env)
+    
+    if isinstance(node, ast.Call):
+        if any(isinstance(a, ast.Starred) for a in node.args) or any(k.arg is None for k in node.keywords):
+            raise ValueError("不支持参数解包")
+        func = _compile_node(node.func)
+        args = [_compile_node(a) for a in node.args]
+        kwargs = [(k.arg, _compile_node(k.value)) for k in node.keywords]
+        return lambda env: func(env)(
+            *[a(env) for a in args], **{k: v(env) for k, v in kwargs}
+        )
+    
+    if isinstance(node, ast.Attribute):
+        value, attr = _compile_node(node.value), node.attr
+        return lambda env: getattr(value(env), attr)
+    
+    if isinstance(node, ast.Subscript):
+        value, index = _compile_node(node.value), _compile_node(node.slice)
+        return lambda env: value(env)[index(env)]
+    
+    if isinstance(node, ast.Slice):
+        parts = [_compile_node(n) if n is not None else None for n in (node.lower, node.upper, node.step)]
+        return lambda env: slice(*(p(env) if p is not None else None for p in parts))
+    
+    if isinstance(node, (ast.Tuple, ast.List, ast.Set)):
+        if any(isinstance(e, ast.Starred) for e in node.elts):
+            raise ValueError("不支持参数解包")
+        container = {ast.Tuple: tuple, ast.List: list, ast.Set: set}[type(node)]
+        elts = [_compile_node(e) for e in node.elts]
+        return lambda env: container([e(env) for e in elts])
+    
+    if isinstance(node, ast.Dict):
+        if any(k is None for k in node.keys):
+            raise ValueError("不支持参数解包")
+        items = [(_compile_node(k), _compile_node(v)) for k, v in zip(node.keys, node.values)]
+        return lambda env: {k(env): v(env) for k, v in items}
+    
+    raise ValueError(f"不支持的语法: {type(node).__name__}")
+
+class _SafetyChecker(ast.NodeVisitor):
+    """表达式安全检查: 收集调用的函数名，拒绝访问私有/魔术属性"""
+    
+    def __init__(self):
+        self.called_names = set()
+    
+    def visit_Call(self, node: ast.Call):
+        if isinstance(node.func, ast.Name):
+            self.called_names.add(node.func.id)
+        self.generic_visit(node)
+    
+    def visit_Attribute(self, node: ast.Attribute):
+        # 防止通过 __class__ 等属性逃逸沙箱
+        if node.attr.startswith('_'):
+            raise ValueError(f"不允许访问属性: {node.attr}")
+        self.generic_visit(node)
+
+@lru_cache(maxsize=1024)
+def _compile_expr(expression: str) -> Tuple[_Evaluator, FrozenSet[str]]:
+    """解析、检查并编译表达式，返回求值函数及其中调用的函数名 (按表达式缓存)"""
+    tree = ast.parse(expression, '<string>', 'eval')
+    
+    checker = _SafetyChecker()
+    checker.visit(tree)
+    
+    return _compile_node(tree.body), frozenset(checker.called_names)
+
 class CalculatorTool(BaseTool):
     """高级计算器工具"""
     
@@ -46,7 +196,8 @@ class CalculatorTool(BaseTool):
                 )
             ],
             returns="计算结果",
-            timeout=5
+            timeout=5,
+            cacheable=True
         )
         super().__init__(metadata)
         # 安全允许的函数
@@ -57,6 +208,7 @@ class CalculatorTool(BaseTool):
             'set': set, 'pow': pow, 'divmod': divmod,
             'math': math  # 导入math模块的函数
         }
+        self._safe_names = frozenset(self.safe_namespace)
     
     async def execute(self, **kwargs) -> Dict[str, Any]:
         """执行计算"""
@@ -65,22 +217,19 @@ class CalculatorTool(BaseTool):
         precision = kwargs.get("precision", 6)
         
         try:
-            # 创建安全的命名空间
-            namespace = {**self.safe_namespace, **variables}
+            # 解析/编译结果按表达式缓存，重复调用只需执行
+            evaluate, called_names = _compile_expr(expression)
             
-            tree = ast.parse(expression, '<string>', 'eval')
-
             # 验证代码安全性
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Call):
-                    if isinstance(node.func, ast.Name):
-                        if node.func.id not in namespace:
-                            raise ValueError(f"不安全函数: {node.func.id}")
+            for name in called_names - self._safe_names:
+                if name not in variables:
+                    raise ValueError(f"不安全函数: {name}")
+            
+            # 创建安全的命名空间 (变量优先，避免每次复制字典)
+            namespace = ChainMap(variables, self.safe_namespace)
             
-            # 禁用危险操作
-            code = compile(tree, '<string>', 'eval')
-            # 执行计算
-            result = eval(code, {"__builtins__": {}}, namespace)
+            # 执行计算 (仅支持白名单语法，不经过 eval)
+            result = evaluate(namespace)
             
             # 处理精度
             if isinstance(result, float):
@@ -98,6 +247,29 @@ class CalculatorTool(BaseTool):
                 "expression": expression
             }
 
+# 字符串列的dtype名 (pandas 3 起为 "str"，之前为 "object")
+_STRING_DTYPE = str(pd.Series(["a"]).dtype)
+
+# int64 的取值范围 (超出时pandas会按值推断为 uint64/object/float64，规则不再简单)
+_INT64_MIN, _INT64_MAX = -2**63, 2**63 - 1
+
+def _infer_dtype(values: List[Any], has_missing: bool, has_nan: bool = False) -> Optional[str]:
+    """按pandas构建DataFrame时的规则推断列类型名，含超出int64范围的整数时返回None"""
+    if not values:
+        # 只有缺失值时，含浮点NaN的列为 float64，全为None的列为 object
+        return "float64" if has_nan else "object"
+    if all(type(v) is bool for v in values):
+        return "object" if has_missing else "bool"
+    if any(type(v) is int and not _INT64_MIN <= v <= _INT64_MAX for v in values):
+        return None
+    if all(type(v) is int for v in values):
+        return "float64" if has_missing else "int64"
+    if all(type(v) in (int, float) for v in values):
+        return "float64"
+    if all(type(v) is str for v in values):
+        return _STRING_DTYPE
+    return "object"
+
 class DataAnalyzerTool(BaseTool):
     """数据分析工具"""
     
@@ -129,7 +301,8 @@ class DataAnalyzerTool(BaseTool):
                 )
             ],
             returns="分析结果",
-            timeout=10
+            timeout=10,
+            cacheable=True
         )
         super().__init__(metadata)
     
@@ -142,6 +315,23 @@ class DataAnalyzerTool(BaseTool):
         try:
             if data_type == "json":
                 data = json.loads(data_str)
+                
+                # 记录列表的摘要直接在原始数据上计算，无需构建DataFrame
+                summary = (
+                    self._summarize_records(data)
+                    if analysis_type == "summary" and isinstance(data, list)
+                    and all(isinstance(record, dict) for record in data)
+                    else None
+                )
+                if summary is not None:
+                    columns, result = summary
+                    return {
+                        "analysis_type": analysis_type,
+                        "data_shape": f"{len(data)}行 x {len(columns)}列",
+                        "columns": columns,
+                        "result": result
+                    }
+                
                 df = pd.DataFrame(data) if isinstance(data, list) else pd.DataFrame([data])
             else:  # csv
                 df = pd.read_csv(StringIO(data_str))
@@ -173,6 +363,39 @@ class DataAnalyzerTool(BaseTool):
             "unique_counts": df.nunique().to_dict()
         }
     
+    def _summarize_records(self, records: List[dict]) -> Optional[Tuple[List[str], Dict[str, Any]]]:
+        """
+        在记录列表上计算与 _get_summary 相同的摘要 (dtype 按pandas的推断规则给出)
+        
+        某列无法按简单规则推断类型时返回None，由调用方回退到DataFrame
+        """
+        columns = list(dict.fromkeys(key for record in records for key in record))
+        dtypes, missing_values, unique_counts = {}, {}, {}
+        
+        for col in columns:
+            present, has_nan = [], False
+            for value in (record.get(col) for record in records):
+                if value is None:
+                    continue
+                if value != value:  # 排除 NaN
+                    has_nan = has_nan or type(value) is float
+                    continue
+                present.append(value)
+            missing = len(records) - len(present)
+            
+            dtype = _infer_dtype(present, missing > 0, has_nan)
+            if dtype is None:
+                return None
+            dtypes[col] = dtype
+            missing_values[col] = missing
+            unique_counts[col] = len(set(present))
+        
+        return columns, {
+            "dtypes": dtypes,
+            "missing_values": missing_values,
+            "unique_counts": unique_counts
+        }
+    
     def _get_statistics(self, df: pd.DataFrame) -> Dict[str, Any]:
         """获取统计信息"""
         numeric_cols = df.select_dtypes(include=[np.number]).columns
@@ -180,19 +403,32 @@ class DataAnalyzerTool(BaseTool):
         if len(numeric_cols) == 0:
             return {"message": "没有数值列可用于统计分析"}
         
-        stats = {}
-        for col in numeric_cols:
-            stats[col] = {
-                "mean": float(df[col].mean()),
-                "median": float(df[col].median()),
-                "std": float(df[col].std()),
-                "min": float(df[col].min()),
-                "max": float(df[col].max()),
-                "q1": float(df[col].quantile(0.25)),
-                "q3": float(df[col].quantile(0.75))
+        values = self._fast_path_values(df, numeric_cols)
+        if values is not None:
+            summary = compute_summary(values)
+            return {
+                col: dict(zip(SUMMARY_KEYS, map(float, summary[:, j])))
+                for j, col in enumerate(numeric_cols)
             }
         
-        return stats
+        # 一次 describe 计算全部统计量，避免逐列多次遍历
+        desc = df[numeric_cols].describe(percentiles=[0.25, 0.5, 0.75]).T.astype(float)
+        
+        return (
+            desc[["mean", "50%", "std", "min", "max", "25%", "75%"]]
+            .rename(columns={"50%": "median", "25%": "q1", "75%": "q3"})
+            .to_dict(orient="index")
+        )
+    
+    def _fast_path_values(self, df: pd.DataFrame, numeric_cols) -> Optional[np.ndarray]:
+        """大规模且不含缺失值的数值数据返回float64数组，否则返回None回退pandas"""
+        if df.shape[0] * len(numeric_cols) <= _FAST_PATH_MIN_CELLS:
+            return None
+        
+        values = df[numeric_cols].to_numpy(dtype=np.float64)
+        if not np.isfinite(values).all():
+            return None
+        return values
     
     def _get_correlation(self, df: pd.DataFrame) -> Dict[str, Any]:
         """获取相关性矩阵"""
@@ -201,7 +437,13 @@ class DataAnalyzerTool(BaseTool):
         if len(numeric_cols) < 2:
             return {"message": "需要至少两个数值列计算相关性"}
         
-        corr_matrix = df[numeric_cols].corr()
+        values = self._fast_path_values(df, numeric_cols)
+        if values is not None:
+            corr_matrix = pd.DataFrame(
+                compute_correlation(values), index=numeric_cols, columns=numeric_cols
+            )
+        else:
+            corr_matrix = df[numeric_cols].corr()
         
         # 转换为字典格式
         return corr_matrix.to_dict()
@@ -209,7 +451,8 @@ class DataAnalyzerTool(BaseTool):
 # 装饰器方式定义的数据工具
 @tool_decorator(
     name="json_validator",
-    description="验证和格式化JSON数据"
+    description="验证和格式化JSON数据",
+    cacheable=True
 )
 async def json_validator(json_str: str, pretty_print: bool = True) -> Dict[str, Any]:
     """
@@ -223,12 +466,8 @@ async def json_validator(json_str: str, pretty_print: bool = True) -> Dict[str,
         验证结果和格式化后的JSON
     """
     try:
-        data = json.loads(json_str)
-        
-        if pretty_print:
-            formatted = json.dumps(data, indent=2, ensure_ascii=False)
-        else:
-            formatted = json.dumps(data, ensure_ascii=False)
+        data = _json_compat.loads(json_str)
+        formatted = _json_compat.dumps(data, indent=pretty_print)
         
         return {
             "valid": True,
@@ -246,23 +485,22 @@ async def json_validator(json_str: str, pretty_print: bool = True) -> Dict[str,
 
 @tool_decorator(
     name="csv_converter",
-    description="将JSON转换为CSV格式"
+    description="将JSON转换为CSV格式",
+    cacheable=True
 )
 async def csv_converter(json_data: str, delimiter: str = ",") -> Dict[str, Any]:
     """将JSON数组转换为CSV格式"""
     try:
-        data = json.loads(json_data)
+        data = _json_compat.loads(json_data)
         
         if not isinstance(data, list):
             data = [data]
         
-        # 确保所有字典有相同的键
-        all_keys = set()
-        for item in data:
-            all_keys.update(item.keys())
+        # 确保所有字典有相同的键 (按首次出现顺序合并)
+        all_keys = list(dict.fromkeys(key for item in data for key in item))
         
         output = StringIO()
-        writer = csv.DictWriter(output, fieldnames=list(all_keys), delimiter=delimiter)
+        writer = csv.DictWriter(output, fieldnames=all_keys, delimiter=delimiter)
         writer.writeheader()
         writer.writerows(data)
         
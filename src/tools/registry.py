@@ -5,14 +5,71 @@
 工具注册与管理中心
 """
 from typing import Dict, List, Any, Callable, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+from collections import OrderedDict
 from functools import wraps
 import inspect
+import copy
 import hashlib
-import json
+import time
+
+# 参数类型名 -> 允许的 Python 类型
+_TYPE_MAP = {
+    "string": (str,),
+    "integer": (int,),
+    "number": (int, float),
+    "boolean": (bool,),
+    "object": (dict,),
+    "array": (list,)
+}
+
+# 函数注解 -> 参数类型名
+_ANNOTATION_TYPE_MAP = {
+    str: "string",
+    int: "integer",
+    float: "number",
+    bool: "boolean",
+    dict: "object",
+    list: "array"
+}
+
+# 每个工具最多缓存的结果数
+_RESULT_CACHE_SIZE = 256
+_CACHE_MISS = object()
+
+def _encode_key(value: Any) -> bytes:
+    """
+    把参数编码为确定的字节串，类型信息一并保留
+    
+    {1: 'a'} 与 {'1': 'a'}、1 与 True、0.0 与 -0.0、列表与元组得到不同的编码;
+    各部分带长度前缀，拼接后不会产生歧义。
+    无法精确表示的值 (numpy数组、自定义对象等) 抛出 TypeError。
+    """
+    kind = type(value)
+    if value is None:
+        return b"N"
+    if kind is bool:
+        return b"T" if value else b"F"
+    if kind is int:
+        body = b"i" + str(value).encode()
+    elif kind is float:
+        # hex 保留符号位与全部精度 (repr 相等的 0.0/-0.0 也能区分)
+        body = b"f" + value.hex().encode()
+    elif kind is str:
+        body = b"s" + value.encode("utf-8", "surrogatepass")
+    elif kind is list or kind is tuple:
+        body = (b"l" if kind is list else b"t") + b"".join(_encode_key(v) for v in value)
+    elif kind is dict:
+        # 字典与插入顺序无关: 按编码后的键值对排序
+        body = b"d" + b"".join(sorted(_encode_key(k) + _encode_key(v) for k, v in value.items()))
+    else:
+        raise TypeError(f"无法作为缓存键: {kind.__name__}")
+    return len(body).to_bytes(8, "little") + body
 
 class ToolParameter(BaseModel):
     """工具参数定义"""
+    model_config = ConfigDict(frozen=True)
+    
     name: str
     type: str
     description: str
@@ -21,6 +78,8 @@ class ToolParameter(BaseModel):
 
 class ToolMetadata(BaseModel):
     """工具元数据"""
+    model_config = ConfigDict(frozen=True)
+    
     name: str
     description: str
     version: str = "1.0.0"
@@ -30,6 +89,8 @@ class ToolMetadata(BaseModel):
     returns: str
     timeout: int = 30  # 超时时间(秒)
     requires_auth: bool = False
+    cacheable: bool = False  # 是否为纯函数工具，可缓存结果
+    cache_ttl_s: int = 300  # 结果缓存有效期(秒)
 
 class BaseTool:
     """工具基类 - 所有工具应继承此类"""
@@ -38,32 +99,28 @@ class BaseTool:
         self.metadata = metadata
         self._call_count = 0
         self._error_count = 0
+        # 结果缓存 (仅对可缓存且无需授权的工具启用)
+        self._cache_enabled = metadata.cacheable and not metadata.requires_auth
+        self._result_cache: OrderedDict = OrderedDict()
+        # 预先计算参数校验计划: (参数名, 是否必需, 类型名, 允许的类型)
+        self._validation_plan = [
+            (p.name, p.required, p.type.lower(), _TYPE_MAP.get(p.type.lower(), ()))
+            for p in metadata.parameters
+        ]
     
     def validate_parameters(self, **kwargs) -> bool:
         """验证参数"""
-        for param in self.metadata.parameters:
-            if param.required and param.name not in kwargs:
-                raise ValueError(f"缺少必需参数: {param.name}")
-            if param.name in kwargs:
-                # 简单类型检查
-                expected_type = param.type.lower()
-                actual_value = kwargs[param.name]
-                
-                type_checks = {
-                    "string": lambda x: isinstance(x, str),
-                    "integer": lambda x: isinstance(x, int),
-                    "number": lambda x: isinstance(x, (int, float)),
-                    "boolean": lambda x: isinstance(x, bool),
-                    "object": lambda x: isinstance(x, dict),
-                    "array": lambda x: isinstance(x, list)
-                }
-                
-                if expected_type in type_checks:
-                    if not type_checks[expected_type](actual_value):
-                        raise TypeError(
-                            f"参数 {param.name} 类型错误: "
-                            f"期望 {expected_type}, 实际 {type(actual_value).__name__}"
-                        )
+        for name, required, type_name, types in self._validation_plan:
+            if name not in kwargs:
+                if required:
+                    raise ValueError(f"缺少必需参数: {name}")
+                continue
+            # 简单类型检查
+            if types and not isinstance(kwargs[name], types):
+                raise TypeError(
+                    f"参数 {name} 类型错误: "
+                    f"期望 {type_name}, 实际 {type(kwargs[name]).__name__}"
+                )
         return True
     
     async def execute(self, **kwargs) -> Any:
@@ -78,8 +135,15 @@ class BaseTool:
             # 验证参数
             self.validate_parameters(**kwargs)
             
-            # 执行工具
-            result = await self.execute(**kwargs)
+            # 执行工具 (可缓存的工具优先读取缓存，参数无法作为缓存键时直接执行)
+            cache_key = self._cache_key(kwargs) if self._cache_enabled else None
+            if cache_key is None:
+                result = await self.execute(**kwargs)
+            else:
+                result = self._cache_get(cache_key)
+                if result is _CACHE_MISS:
+                    result = await self.execute(**kwargs)
+                    self._cache_put(cache_key, result)
             
             return {
                 "success": True,
@@ -96,6 +160,37 @@ class BaseTool:
                 "traceback": None  # 生产环境可记录详细堆栈
             }
     
+    def _cache_key(self, kwargs: dict) -> Optional[bytes]:
+        """根据参数计算缓存键 (只保存摘要，不持有参数本身)，参数无法精确表示时返回 None (不缓存)"""
+        try:
+            payload = _encode_key(kwargs)
+        except TypeError:
+            return None
+        return hashlib.blake2b(payload, digest_size=16).digest()
+    
+    def _cache_get(self, key: bytes) -> Any:
+        """读取未过期的缓存结果 (返回副本，调用方修改结果不影响缓存)"""
+        entry = self._result_cache.get(key)
+        if entry is None:
+            return _CACHE_MISS
+        
+        expires_at, result = entry
+        if expires_at < time.monotonic():
+            del self._result_cache[key]
+            return _CACHE_MISS
+        
+        self._result_cache.move_to_end(key)
+        return copy.deepcopy(result)
+    
+    def _cache_put(self, key: bytes, result: Any):
+        """写入缓存结果快照，超出容量时淘汰最久未使用的条目"""
+        self._result_cache[key] = (
+            time.monotonic() + self.metadata.cache_ttl_s, copy.deepcopy(result)
+        )
+        self._result_cache.move_to_end(key)
+        if len(self._result_cache) > _RESULT_CACHE_SIZE:
+            self._result_cache.popitem(last=False)
+    
     def get_stats(self) -> dict:
         """获取工具统计信息"""
         return {
@@ -107,64 +202,62 @@ class BaseTool:
             )
         }
 
-def tool_decorator(name: str = None, description: str = None):
+def tool_decorator(name: str = None, description: str = None, cacheable: bool = False):
     """工具装饰器 - 将普通函数转换为工具"""
     def decorator(func: Callable):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            return func(*args, **kwargs)
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                return await func(*args, **kwargs)
+        else:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                return func(*args, **kwargs)
         
-        async def async_wrapper(*args, **kwargs):
-            print("async_wrapper 执行...")
-            return await func(*args, **kwargs)
+        wrapper.metadata = _build_metadata(func, name, description, cacheable)
+        return wrapper
+    return decorator
 
-        # 从函数签名提取元数据
-        sig = inspect.signature(func)
-        parameters = []
+def _build_metadata(func: Callable, name: Optional[str], description: Optional[str],
+                    cacheable: bool) -> ToolMetadata:
+    """从函数签名提取元数据"""
+    sig = inspect.signature(func)
+    parameters = []
+    
+    for param_name, param in sig.parameters.items():
+        param_type = "string"  # 默认类型
         
-        for param_name, param in sig.parameters.items():
-            param_type = "string"  # 默认类型
-            
-            if param.annotation != inspect.Parameter.empty:
-                type_map = {
-                    str: "string",
-                    int: "integer",
-                    float: "number",
-                    bool: "boolean",
-                    dict: "object",
-                    list: "array"
-                }
-                param_type = type_map.get(param.annotation, "string")
-            
-            parameters.append(ToolParameter(
-                name=param_name,
-                type=param_type,
-                description=f"参数 {param_name}",
-                required=param.default == inspect.Parameter.empty,
-                default=param.default if param.default != inspect.Parameter.empty else None
-            ))
+        if param.annotation != inspect.Parameter.empty:
+            param_type = _ANNOTATION_TYPE_MAP.get(param.annotation, "string")
         
-        wrapper.metadata = ToolMetadata(
-            name=name or func.__name__,
-            description=description or func.__doc__ or "无描述",
-            parameters=parameters,
-            returns="执行结果"
-        )
-        
-        return wrapper
-    return decorator
+        parameters.append(ToolParameter(
+            name=param_name,
+            type=param_type,
+            description=f"参数 {param_name}",
+            required=param.default == inspect.Parameter.empty,
+            default=param.default if param.default != inspect.Parameter.empty else None
+        ))
+    
+    return ToolMetadata(
+        name=name or func.__name__,
+        description=description or func.__doc__ or "无描述",
+        parameters=parameters,
+        returns="执行结果",
+        cacheable=cacheable
+    )
 
 class ToolRegistry:
     """工具注册表 - 单例管理所有工具"""
     
-    _instance = None
-    
     def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance._tools = {}
-            cls._instance._categories = {}
-        return cls._instance
+        # 单例在模块导入时创建，这里直接返回，无需判断或加锁
+        return _REGISTRY
+    
+    def _init_state(self):
+        """初始化单例内部状态"""
+        self._tools = {}
+        self._categories = {}
+        self._search_blob = {}
     
     def register(self, tool: BaseTool) -> bool:
         """注册工具"""
@@ -179,6 +272,11 @@ class ToolRegistry:
             self._categories[category] = []
         self._categories[category].append(tool.metadata.name)
         
+        # 预先计算小写检索文本 (以 \0 分隔，避免跨字段误匹配)
+        self._search_blob[tool.metadata.name] = (
+            f"{tool.metadata.name}\0{tool.metadata.description}\0{category}".lower()
+        )
+        
         return True
     
     def register_function(self, func: Callable) -> bool:
@@ -205,7 +303,8 @@ class ToolRegistry:
         """列出所有工具信息"""
         tools_info = []
         for name, tool in self._tools.items():
-            info = tool.metadata.dict()
+            # 每次返回新的字典，调用方修改结果不会影响工具元数据
+            info = tool.metadata.model_dump()
             info["stats"] = tool.get_stats()
             tools_info.append(info)
         return tools_info
@@ -215,14 +314,10 @@ class ToolRegistry:
         results = []
         query_lower = query.lower()
         
-        for name, tool in self._tools.items():
-            metadata = tool.metadata
-            
+        for name, blob in self._search_blob.items():
             # 在名称、描述、分类中搜索
-            if (query_lower in name.lower() or 
-                query_lower in metadata.description.lower() or
-                query_lower in metadata.category.lower()):
-                
+            if query_lower in blob:
+                metadata = self._tools[name].metadata
                 results.append({
                     "name": name,
                     "description": metadata.description,
@@ -248,6 +343,7 @@ class ToolRegistry:
             
             # 从主字典移除
             del self._tools[name]
+            del self._search_blob[name]
             return True
         return False
     
@@ -255,10 +351,18 @@ class ToolRegistry:
         """清空所有工具"""
         self._tools.clear()
         self._categories.clear()
+        self._search_blob.clear()
+
+# 模块级单例 (导入过程受导入锁保护，多线程下也只会创建一次)
+_REGISTRY = object.__new__(ToolRegistry)
+_REGISTRY._init_state()
 
 async def main():
     """演示工具系统使用"""
-    from web_tools import WebSearchTool, APICallerTool, fetch_webpage, check_website_status, fetch_dynamic_webpage
+    from web_tools import (
+        WebSearchTool, APICallerTool, fetch_webpage, check_website_status, fetch_dynamic_webpage,
+        close_shared_resources
+    )
     from data_tools import CalculatorTool, DataAnalyzerTool, json_validator
     from custom_tools import FileReaderTool, TimeSensitiveTool, generate_password
 
@@ -283,6 +387,9 @@ async def main():
     a = registry.get_tool('fetch_dynamic_webpage')
     b = await a.safe_execute(url='www.baidu.com')
     
+    # 关闭共享会话与浏览器
+    await close_shared_resources()
+    
 
     1
 
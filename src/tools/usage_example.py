@@ -5,7 +5,10 @@
 import asyncio
 import json
 from registry import ToolRegistry
-from web_tools import WebSearchTool, APICallerTool, fetch_webpage, check_website_status, fetch_dynamic_webpage
+from web_tools import (
+    WebSearchTool, APICallerTool, fetch_webpage, check_website_status, fetch_dynamic_webpage,
+    close_shared_resources
+)
 from data_tools import CalculatorTool, DataAnalyzerTool, json_validator
 from custom_tools import FileReaderTool, TimeSensitiveTool, generate_password
 
@@ -29,44 +32,50 @@ async def main():
     registry.register_function(json_validator)
     registry.register_function(generate_password)
     
-    a = registry.get_tool('fetch_dynamic_webpage')
-    b = await a.safe_execute(url='www.baidu.com')
-
-    # 4. 列出所有工具
-    print("=== 所有可用工具 ===")
-    for tool_info in registry.list_all_tools():
-        print(f"- {tool_info['name']}: {tool_info['description']}")
-    
-
-    # 5. 使用计算器工具
-    print("\n=== 使用计算器工具 ===")
-    calculator = registry.get_tool("calculator")
-    if calculator:
-        result = await calculator.safe_execute(
-            expression="math.sin(math.pi/2) + math.sqrt(16)",
-            variables={},
-            precision=4
+    # 动态网页抓取 (启动浏览器) 最耗时，放到后台执行，与后续步骤重叠
+    async with asyncio.TaskGroup() as tg:
+        dynamic_task = tg.create_task(
+            registry.get_tool('fetch_dynamic_webpage').safe_execute(url='www.baidu.com')
         )
-        print(f"计算结果: {result}")
-    
-    # 6. 搜索工具
-    print("\n=== 搜索 '数据分析' 相关工具 ===")
-    search_results = registry.search_tools("web_search")
-    for tool in search_results:
-        print(f"- {tool['name']} ({tool['category']}): {tool['description']}")
-    
-    # 7. 使用装饰器工具
-    print("\n=== 使用装饰器工具 ===")
-    password_tool = registry.get_tool("generate_password")
-    if password_tool:
-        result = await password_tool.safe_execute(
-            length=16,
-            use_uppercase=True,
-            use_numbers=True,
-            use_symbols=True
-        )
-        print(f"生成的密码: {result}")
-    
+        await asyncio.sleep(0)  # 让后台任务先开始启动浏览器
+        
+        # 4. 列出所有工具
+        print("=== 所有可用工具 ===")
+        for tool_info in registry.list_all_tools():
+            print(f"- {tool_info['name']}: {tool_info['description']}")
+        
+        # 5. 使用计算器工具
+        print("\n=== 使用计算器工具 ===")
+        calculator = registry.get_tool("calculator")
+        if calculator:
+            result = await calculator.safe_execute(
+                expression="math.sin(math.pi/2) + math.sqrt(16)",
+                variables={},
+                precision=4
+            )
+            print(f"计算结果: {result}")
+        
+        # 6. 搜索工具
+        print("\n=== 搜索 '数据分析' 相关工具 ===")
+        search_results = registry.search_tools("web_search")
+        for tool in search_results:
+            print(f"- {tool['name']} ({tool['category']}): {tool['description']}")
+        
+        # 7. 使用装饰器工具
+        print("\n=== 使用装饰器工具 ===")
+        password_tool = registry.get_tool("generate_password")
+        if password_tool:
+            result = await password_tool.safe_execute(
+                length=16,
+                use_uppercase=True,
+                use_numbers=True,
+                use_symbols=True
+            )
+            print(f"生成的密码: {result}")
+        
+        print("\n=== 动态网页抓取 ===")
+        print(f"抓取结果: {await dynamic_task}")
+        
     # 8. 按分类获取工具
     print("\n=== 按分类查看工具 ===")
     web_tools = registry.get_tools_by_category("web")
@@ -82,6 +91,9 @@ async def main():
     for tool_info in registry.list_all_tools():
         print(f"{tool_info['name']}: 调用 {tool_info['stats']['call_count']} 次, "
               f"成功率 {tool_info['stats']['success_rate']:.1%}")
+    
+    # 11. 关闭共享的网络会话与浏览器
+    await close_shared_resources()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -7,12 +7,260 @@
 # Playwright 示例（异步）
 from playwright.async_api import async_playwright
 import aiohttp
+from selectolax.lexbor import LexborHTMLParser
 import asyncio
+import base64
+import time
+from collections import OrderedDict
 from typing import Optional, Dict, List, Any
-from urllib.parse import urlencode
+from urllib.parse import quote_plus, urlparse, parse_qs
 import json
 from datetime import datetime
+from functools import lru_cache
 from registry import BaseTool, ToolMetadata, ToolParameter, tool_decorator
+import _json_compat
+
+# 默认请求头 (模块级常量，避免每次请求重新构建)
+_DEFAULT_UA_HEADERS = {"User-Agent": "Agent-System/1.0"}
+_SEARCH_UA_HEADERS = {"User-Agent": "Mozilla/5.0 (兼容Agent系统)"}
+
+# 所有网络工具共享的HTTP会话 (复用连接池与keep-alive连接)
+_SESSION: Optional[aiohttp.ClientSession] = None
+_SESSION_LOCK: Optional[asyncio.Lock] = None
+
+# 共享资源所属的事件循环 (会话、浏览器与锁都只能在创建它们的循环中使用)
+_RESOURCE_LOOP: Optional[asyncio.AbstractEventLoop] = None
+# 挂在所属事件循环上的异步生成器，循环关闭时负责清理共享资源
+_LOOP_GUARD = None
+
+async def _close_on_loop_shutdown():
+    """
+    asyncio.run 结束前会对未完成的异步生成器调用 aclose()，
+    借此在事件循环关闭前兜底释放未显式关闭的共享会话与浏览器
+    """
+    try:
+        yield
+    finally:
+        await _close_resources(loop_shutdown=True)
+
+async def _bind_loop():
+    """
+    将共享资源绑定到当前事件循环
+    
+    事件循环变化时 (如多次调用 asyncio.run) 旧循环中的会话与浏览器已无法使用，
+    丢弃它们并为新循环重新创建锁。
+    """
+    global _RESOURCE_LOOP, _LOOP_GUARD, _SESSION, _PW, _BROWSER, _CONTEXT_POOL, _POOL_BROWSER
+    global _SESSION_LOCK, _PW_LOCK, _POOL_LOCK
+    loop = asyncio.get_running_loop()
+    if loop is _RESOURCE_LOOP:
+        return
+    
+    if _SESSION is not None and not _SESSION.closed:
+        # 旧循环未正常清理 (未调用 close_shared_resources)，只能断开会话与连接器的关联
+        _SESSION.detach()
+    _SESSION = _PW = _BROWSER = _CONTEXT_POOL = _POOL_BROWSER = None
+    _STATUS_INFLIGHT.clear()
+    _RECYCLE_TASKS.clear()
+    _SESSION_LOCK, _PW_LOCK, _POOL_LOCK = asyncio.Lock(), asyncio.Lock(), asyncio.Lock()
+    _RESOURCE_LOOP = loop
+    
+    _LOOP_GUARD = _close_on_loop_shutdown()
+    await _LOOP_GUARD.__anext__()
+
+@lru_cache(maxsize=32)
+def _timeout(total: int) -> aiohttp.ClientTimeout:
+    """按超时秒数复用 ClientTimeout 对象"""
+    return aiohttp.ClientTimeout(total=total)
+
+
+async def _get_session() -> aiohttp.ClientSession:
+    """获取共享HTTP会话，首次调用或事件循环变化时创建"""
+    global _SESSION
+    await _bind_loop()
+    if _SESSION is None or _SESSION.closed:
+        async with _SESSION_LOCK:
+            if _SESSION is None or _SESSION.closed:
+                _SESSION = aiohttp.ClientSession(
+                    json_serialize=_json_compat.dumps,
+                    trust_env=True,  # 使用环境变量中的代理配置
+                    connector=aiohttp.TCPConnector(
+                        limit=200,
+                        limit_per_host=32,
+                        ttl_dns_cache=300,
+                        keepalive_timeout=60
+                    )
+                )
+    return _SESSION
+
+# 共享的Playwright实例与浏览器 (避免每次调用都启动Chromium)
+_PW = None
+_BROWSER = None
+_PW_LOCK: Optional[asyncio.Lock] = None
+
+async def _get_browser():
+    """获取共享浏览器，首次调用、浏览器断开或事件循环变化时启动"""
+    global _PW, _BROWSER
+    await _bind_loop()
+    if _BROWSER is None or not _BROWSER.is_connected():
+        async with _PW_LOCK:
+            if _BROWSER is None or not _BROWSER.is_connected():
+                if _PW is None:
+                    _PW = await async_playwright().start()
+                _BROWSER = await _PW.chromium.launch(
+                    channel="chrome",
+                    headless=True
+                )
+    return _BROWSER
+
+# 预先创建的浏览器上下文池，用于并发抓取多个动态网页
+_CONTEXT_POOL_SIZE = 8
+_CONTEXT_POOL: Optional[asyncio.Queue] = None
+_POOL_BROWSER = None
+_POOL_LOCK: Optional[asyncio.Lock] = None
+
+# 正在后台替换上下文的任务 (保留强引用，避免任务在完成前被垃圾回收)
+_RECYCLE_TASKS: set = set()
+
+# 抓取动态内容时不需要加载的资源类型
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+
+async def _block_heavy_resources(route):
+    """拦截图片、字体、媒体等与页面文本无关的请求"""
+    if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+async def _new_context(browser):
+    """创建屏蔽重资源请求的浏览器上下文"""
+    context = await browser.new_context()
+    await context.route("**/*", _block_heavy_resources)
+    return context
+
+async def _get_context_pool() -> asyncio.Queue:
+    """获取浏览器上下文池，浏览器重启后重新创建"""
+    global _CONTEXT_POOL, _POOL_BROWSER
+    browser = await _get_browser()
+    if _CONTEXT_POOL is None or _POOL_BROWSER is not browser:
+        async with _POOL_LOCK:
+            if _CONTEXT_POOL is None or _POOL_BROWSER is not browser:
+                pool = asyncio.Queue()
+                contexts = await asyncio.gather(
+                    *(_new_context(browser) for _ in range(_CONTEXT_POOL_SIZE))
+                )
+                for context in contexts:
+                    pool.put_nowait(context)
+                _CONTEXT_POOL, _POOL_BROWSER = pool, browser
+    return _CONTEXT_POOL
+
+def _remaining_ms(deadline: float) -> float:
+    """距截止时间的剩余毫秒数 (至少为1，Playwright 中 0 表示不超时)"""
+    return max(1.0, (deadline - time.monotonic()) * 1000)
+
+async def _fetch_dynamic_one(pool: asyncio.Queue, url: str, timeout: float,
+                             selector: str = "#dynamic-content") -> Any:
+    """从上下文池借用一个上下文抓取动态网页内容 (timeout 为加载页面与等待元素的总时长)"""
+    deadline = time.monotonic() + timeout
+    try:
+        # 并发调用超过池大小时需排队等待空闲上下文，等待时间同样计入超时
+        context = await asyncio.wait_for(pool.get(), deadline - time.monotonic())
+    except asyncio.TimeoutError:
+        return {"url": url, "error": f"等待空闲浏览器上下文超时 ({timeout}秒)", "status_code": 0}
+    try:
+        page = await context.new_page()
+        try:
+            # DOM解析完成即可，只等待目标元素出现，不等待全部子资源加载
+            await page.goto(url, wait_until="domcontentloaded", timeout=_remaining_ms(deadline))
+            await page.wait_for_selector(selector, timeout=_remaining_ms(deadline))
+            return await page.inner_text(selector)
+        finally:
+            await page.close()
+    except Exception as e:
+        return {"url": url, "error": str(e), "status_code": 0}
+    finally:
+        # 在后台替换上下文，调用方无需等待新上下文创建即可拿到结果；
+        # create_task 是同步调用，调用方被取消时上下文同样会归还到池中
+        task = asyncio.create_task(_recycle_context(pool, context))
+        _RECYCLE_TASKS.add(task)
+        task.add_done_callback(_RECYCLE_TASKS.discard)
+
+async def _recycle_context(pool: asyncio.Queue, context):
+    """
+    用新的上下文替换用过的上下文并放回池中
+    
+    上下文会保留Cookie、localStorage等站点状态，直接复用会让后续无关的抓取看到之前的登录或同意状态。
+    """
+    try:
+        browser = context.browser
+        await context.close()
+        context = await _new_context(browser)
+    except Exception:
+        # 浏览器已断开时放回原上下文，下次获取上下文池时会随新浏览器整体重建
+        pass
+    pool.put_nowait(context)
+
+async def close_shared_resources():
+    """
+    关闭共享HTTP会话与浏览器
+    
+    应在事件循环结束前显式调用 (包括使用 asyncio.run 时)。
+    asyncio.run 在循环关闭前只会兜底停止浏览器驱动，不会正常关闭浏览器。
+    """
+    guard = _LOOP_GUARD
+    if guard is not None and _RESOURCE_LOOP is asyncio.get_running_loop():
+        await _close_resources()
+        await guard.aclose()
+
+# 事件循环关闭时停止Playwright驱动的最长等待时间(秒)
+_SHUTDOWN_STOP_TIMEOUT = 5
+
+async def _close_resources(loop_shutdown: bool = False):
+    """
+    关闭当前事件循环中的共享资源，下次使用时重新创建
+    
+    loop_shutdown 为 True 时 asyncio.run 已取消所有任务 (包括Playwright读取驱动响应的任务)，
+    浏览器的关闭请求收不到回复，因此跳过浏览器，只限时停止驱动 (驱动退出时浏览器随之退出)。
+    """
+    global _RESOURCE_LOOP, _LOOP_GUARD, _SESSION, _PW, _BROWSER, _CONTEXT_POOL, _POOL_BROWSER
+    _RESOURCE_LOOP = _LOOP_GUARD = None
+    
+    if _SESSION is not None and not _SESSION.closed:
+        await _SESSION.close()
+    _SESSION = None
+    
+    # 关闭浏览器时会一并关闭池中的上下文；先等后台替换完成，避免在关闭中的浏览器上创建上下文
+    if _RECYCLE_TASKS and not loop_shutdown:
+        await asyncio.gather(*_RECYCLE_TASKS, return_exceptions=True)
+    _RECYCLE_TASKS.clear()
+    _CONTEXT_POOL = _POOL_BROWSER = None
+    browser, pw = _BROWSER, _PW
+    _BROWSER = _PW = None
+    if browser is not None and not loop_shutdown:
+        await browser.close()
+    if pw is not None:
+        if loop_shutdown:
+            try:
+                await asyncio.wait_for(pw.stop(), _SHUTDOWN_STOP_TIMEOUT)
+            except Exception:
+                # 超时或驱动已退出，循环即将关闭，无法再做更多清理
+                pass
+        else:
+            await pw.stop()
+
+# DuckDuckGo HTML结果页中每个结果块的起始标记
+_DDG_RESULT_MARKER = b'class="result '
+# 广告结果块同样带有 result 类，需从计数中扣除
+_DDG_AD_MARKER = b"result--ad"
+_BODY_END = b"</body>"
+
+def _unwrap_ddg_redirect(href: str) -> str:
+    """从DuckDuckGo跳转链接 (//duckduckgo.com/l/?uddg=...) 中取出真实URL"""
+    if "duckduckgo.com/l/" in href:
+        target = parse_qs(urlparse(href).query).get("uddg")
+        if target:
+            return target[0]
+    return href
 
 class WebSearchTool(BaseTool):
     """网页搜索工具 (可替换为 SerpAPI、Google Search API 等)"""
@@ -51,11 +299,8 @@ class WebSearchTool(BaseTool):
         self.session = None
     
     async def _ensure_session(self):
-        """确保HTTP会话"""
-        if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=self.metadata.timeout)
-            )
+        """确保HTTP会话 (共享会话已可用时 _get_session 直接返回，事件循环变化时重建)"""
+        self.session = await _get_session()
     
     async def execute(self, **kwargs) -> List[Dict[str, Any]]:
         """执行搜索"""
@@ -72,13 +317,14 @@ class WebSearchTool(BaseTool):
             return await self._search_duckduckgo(query, max_results)
         else:
             # 模拟返回，实际应调用相应API
+            timestamp = datetime.now().isoformat()
             return [
                 {
                     "title": f"搜索结果 {i} - {query}",
                     "url": f"https://example.com/result{i}",
                     "snippet": f"这是关于 '{query}' 的模拟结果 {i}。生产环境请替换为真实API。",
                     "source": search_engine,
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": timestamp
                 }
                 for i in range(1, max_results + 1)
             ]
@@ -86,30 +332,64 @@ class WebSearchTool(BaseTool):
     async def _search_duckduckgo(self, query: str, max_results: int) -> List[Dict]:
         """使用DuckDuckGo搜索 (示例)"""
         try:
-            url = f"https://html.duckduckgo.com/html/?{urlencode({'q': query})}"
+            url = f"https://html.duckduckgo.com/html/?q={quote_plus(query)}"
             
-            async with self.session.get(url, headers={
-                "User-Agent": "Mozilla/5.0 (兼容Agent系统)"
-            }) as response:
-                html = await response.text()
+            async with self.session.get(
+                url, headers=_SEARCH_UA_HEADERS, timeout=_timeout(self.metadata.timeout)
+            ) as response:
+                # 流式读取，已包含足够结果块或文档结束时提前停止
+                buf = bytearray()
+                result_blocks = 0
+                async for chunk in response.content.iter_chunked(64 * 1024):
+                    # 从上一块末尾回退 len(marker)-1 字节开始查找，跨块的标记也能被找到且不会重复计数
+                    end = len(buf)
+                    buf.extend(chunk)
+                    result_blocks += (
+                        buf.count(_DDG_RESULT_MARKER, max(0, end - len(_DDG_RESULT_MARKER) + 1))
+                        - buf.count(_DDG_AD_MARKER, max(0, end - len(_DDG_AD_MARKER) + 1))
+                    )
+                    # 非广告结果块超过 max_results 时，前 max_results 个结果已完整
+                    if result_blocks > max_results or buf.find(
+                        _BODY_END, max(0, end - len(_BODY_END) + 1)
+                    ) != -1:
+                        break
                 
-                # 这里简化处理，实际应解析HTML
-                return [
-                    {
-                        "title": f"DuckDuckGo结果: {query}",
-                        "url": "https://duckduckgo.com",
-                        "snippet": "实际实现需要HTML解析",
-                        "source": "duckduckgo",
-                        "timestamp": datetime.now().isoformat()
-                    }
-                ]
+                html = buf.decode(response.charset or "utf-8", errors="replace")
+            
+            return self._parse_duckduckgo(html, max_results)
         except Exception as e:
             return [{"error": f"搜索失败: {str(e)}"}]
     
+    def _parse_duckduckgo(self, html: str, max_results: int) -> List[Dict]:
+        """解析DuckDuckGo HTML结果页"""
+        timestamp = datetime.now().isoformat()
+        results = []
+        
+        for node in LexborHTMLParser(html).css("div.result"):
+            if len(results) >= max_results:
+                break
+            # 跳过广告结果
+            if "result--ad" in (node.attributes.get("class") or ""):
+                continue
+            
+            link = node.css_first(".result__title a")
+            if link is None:
+                continue
+            snippet = node.css_first(".result__snippet")
+            
+            results.append({
+                "title": link.text().strip(),
+                "url": _unwrap_ddg_redirect(link.attributes.get("href") or ""),
+                "snippet": snippet.text().strip() if snippet else "",
+                "source": "duckduckgo",
+                "timestamp": timestamp
+            })
+        
+        return results
+    
     async def close(self):
-        """关闭资源"""
-        if self.session and not self.session.closed:
-            await self.session.close()
+        """释放资源 (共享会话由 close_shared_resources 统一关闭)"""
+        self.session = None
 
 class APICallerTool(BaseTool):
     """通用API调用工具"""
@@ -160,6 +440,13 @@ class APICallerTool(BaseTool):
                     description="超时时间(秒)",
                     required=False,
                     default=30
+                ),
+                ToolParameter(
+                    name="include_headers",
+                    type="boolean",
+                    description="是否返回完整响应头",
+                    required=False,
+                    default=False
                 )
             ],
             returns="API响应",
@@ -169,8 +456,7 @@ class APICallerTool(BaseTool):
         self.session = None
     
     async def _ensure_session(self):
-        if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession()
+        self.session = await _get_session()
     
     async def execute(self, **kwargs) -> Dict[str, Any]:
         """执行API调用"""
@@ -182,6 +468,7 @@ class APICallerTool(BaseTool):
         params = kwargs.get("params", {})
         data = kwargs.get("data", {})
         timeout = kwargs.get("timeout", 30)
+        include_headers = kwargs.get("include_headers", False)
         
         # 设置默认请求头
         if "Content-Type" not in headers and method in ["POST", "PUT", "PATCH"]:
@@ -194,88 +481,237 @@ class APICallerTool(BaseTool):
                 headers=headers,
                 params=params,
                 json=data if method in ["POST", "PUT", "PATCH"] else None,
-                timeout=aiohttp.ClientTimeout(total=timeout)
+                timeout=_timeout(timeout)
             ) as response:
-                # 尝试解析JSON响应
-                try:
-                    response_data = await response.json()
-                except:
+                # 按 Content-Type 选择解析方式，避免对非JSON响应先尝试解析
+                content_type = response.content_type
+                data_encoding = None
+                if "json" in content_type:
+                    body = await response.read()
+                    try:
+                        # 空响应体 (如204) 与 response.json() 一致返回None
+                        response_data = _json_compat.loads(body) if body.strip() else None
+                    except ValueError:
+                        response_data = body.decode(response.charset or "utf-8", errors="replace")
+                elif content_type.startswith("text/") or content_type.endswith("xml"):
                     response_data = await response.text()
+                else:
+                    # 二进制内容以base64编码返回，保证结果可序列化
+                    response_data = base64.b64encode(await response.read()).decode()
+                    data_encoding = "base64"
                 
-                return {
+                result = {
                     "status_code": response.status,
-                    "headers": dict(response.headers),
+                    "content_type": response.headers.get("Content-Type"),
                     "data": response_data,
                     "url": str(response.url),
                     "success": 200 <= response.status < 300
                 }
+                if data_encoding:
+                    result["data_encoding"] = data_encoding
+                # 完整响应头仅在需要时复制
+                if include_headers:
+                    result["headers"] = dict(response.headers)
+                return result
         except asyncio.TimeoutError:
             return {"error": f"请求超时 ({timeout}秒)", "success": False}
         except Exception as e:
             return {"error": str(e), "success": False}
     
     async def close(self):
-        if self.session and not self.session.closed:
-            await self.session.close()
+        self.session = None
+
+async def _fetch_text(session: aiohttp.ClientSession, url: str, timeout: float,
+                      max_bytes: int = 0) -> str:
+    """获取单个网页内容，失败时抛出异常"""
+    async with session.get(
+        url, 
+        timeout=_timeout(timeout),
+        headers=_DEFAULT_UA_HEADERS
+    ) as response:
+        if max_bytes <= 0:
+            return await response.text()
+        
+        # 只需要前 max_bytes 字节时流式读取，读够即停止
+        buf = bytearray()
+        async for chunk in response.content.iter_chunked(16384):
+            buf.extend(chunk)
+            if len(buf) >= max_bytes:
+                break
+        return buf[:max_bytes].decode(response.charset or "utf-8", errors="replace")
+
+async def _fetch_one(session: aiohttp.ClientSession, url: str, timeout: float,
+                     max_bytes: int = 0) -> str:
+    """获取单个网页内容，失败时返回错误信息"""
+    try:
+        return await _fetch_text(session, url, timeout, max_bytes)
+    except Exception as e:
+        return f"获取网页失败: {str(e)}"
+
+async def _check_one(session: aiohttp.ClientSession, url: str) -> Dict[str, Any]:
+    """检查单个网站状态，失败时返回错误信息"""
+    try:
+        async with session.head(url, allow_redirects=True) as response:
+            return {
+                "url": url,
+                "status_code": response.status,
+                "content_type": response.headers.get("Content-Type"),
+                "final_url": str(response.url)
+            }
+    except Exception as e:
+        return {"url": url, "error": str(e), "status_code": 0}
+
+# 网站状态缓存: url -> (过期时间, 结果)，按最近使用淘汰
+_STATUS_CACHE_SIZE = 1024
+_STATUS_CACHE_TTL = 60
+_STATUS_CACHE: OrderedDict = OrderedDict()
+# 正在进行中的状态检查，同一URL的并发请求共享一次检查
+_STATUS_INFLIGHT: Dict[str, asyncio.Task] = {}
+
+async def _check_cached(session: aiohttp.ClientSession, url: str) -> Dict[str, Any]:
+    """带短期缓存的网站状态检查"""
+    entry = _STATUS_CACHE.get(url)
+    if entry is not None:
+        if entry[0] > time.monotonic():
+            _STATUS_CACHE.move_to_end(url)
+            # 结果为扁平字典，浅拷贝即可避免调用方修改影响缓存
+            return dict(entry[1])
+        del _STATUS_CACHE[url]
+    
+    task = _STATUS_INFLIGHT.get(url)
+    if task is None:
+        task = asyncio.ensure_future(_check_one(session, url))
+        _STATUS_INFLIGHT[url] = task
+        task.add_done_callback(lambda _: _STATUS_INFLIGHT.pop(url, None))
+    
+    # shield: 某个等待方被取消时不影响共享同一检查的其他调用
+    result = await asyncio.shield(task)
+    
+    # 只缓存成功的检查结果
+    if "error" not in result and url not in _STATUS_CACHE:
+        _STATUS_CACHE[url] = (time.monotonic() + _STATUS_CACHE_TTL, result)
+        if len(_STATUS_CACHE) > _STATUS_CACHE_SIZE:
+            _STATUS_CACHE.popitem(last=False)
+    # 共享同一检查的等待方各自拿到独立的副本
+    return dict(result)
 
 # 装饰器方式定义的网络工具
 @tool_decorator(
     name="fetch_webpage",
     description="获取网页内容"
 )
-async def fetch_webpage(url: str, timeout: int = 10) -> str:
+async def fetch_webpage(url: str, timeout: int = 10, max_bytes: int = 0) -> str:
     """
     获取指定URL的网页内容
     
     Args:
         url: 网页URL
         timeout: 超时时间(秒)
+        max_bytes: 最多读取的字节数，0或负数表示读取全部
     
     Returns:
         网页HTML内容
     """
     print('fetch_webpage')
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.get(
-                url, 
-                timeout=aiohttp.ClientTimeout(total=timeout),
-                headers={"User-Agent": "Agent-System/1.0"}
-            ) as response:
-                return await response.text()
-        except Exception as e:
-            return f"获取网页失败: {str(e)}"
+    return await _fetch_one(await _get_session(), url, timeout, max_bytes)
+
+@tool_decorator(
+    name="fetch_many_webpages",
+    description="并发获取多个网页内容"
+)
+async def fetch_many_webpages(urls: list, timeout: int = 10, max_bytes: int = 0) -> List[str]:
+    """
+    并发获取多个URL的网页内容
+    
+    Args:
+        urls: 网页URL列表
+        timeout: 单个网页的超时时间(秒)
+        max_bytes: 每个网页最多读取的字节数，0或负数表示读取全部
+    
+    Returns:
+        与urls顺序一致的网页HTML内容列表
+    """
+    session = await _get_session()
+    return await asyncio.gather(
+        *(_fetch_one(session, url, timeout, max_bytes) for url in urls)
+    )
+
+# fetch_dynamic_webpage 的静态HTML探测占总超时的比例
+_PROBE_TIMEOUT_SHARE = 0.25
 
 @tool_decorator(
     name="fetch_dynamic_webpage",
     description="获取客户端渲染的动态网页内容"
 )
-async def fetch_dynamic_webpage(url: str, timeout: int = 10) -> str:
+async def fetch_dynamic_webpage(url: str, timeout: int = 10,
+                                selector: str = "#dynamic-content") -> str:
     """
     获取指定URL的网页内容
     
     Args:
         url: 网页URL
         timeout: 超时时间(秒)
+        selector: 目标元素的CSS选择器
     
     Returns:
-        网页HTML内容
+        目标元素的文本内容
     """
     
     print('fetch_dynamic_webpage')
-    async with async_playwright() as session:
-        try:
-            browser = await session.chromium.launch(
-                channel="chrome",
-                headless=True
-                )
-            page = await browser.new_page()
-            await page.goto(url)
-            content = await page.inner_text("#dynamic-content")
-            await browser.close()
-            return content
-        except Exception as e:
-            return {"url": url, "error": str(e), "status_code": 0}
+    deadline = time.monotonic() + timeout
+    
+    # 先用普通HTTP请求探测，目标元素已在静态HTML中时无需启动浏览器
+    # 探测只占用一小部分时间预算，其余留给浏览器
+    try:
+        html = await _fetch_text(await _get_session(), url, timeout * _PROBE_TIMEOUT_SHARE)
+        node = LexborHTMLParser(html).css_first(selector)
+    except Exception:
+        # 请求失败或无法解析时交给浏览器
+        node = None
+    if node is not None:
+        text = node.text().strip()
+        if text:
+            return text
+    
+    try:
+        # 复用共享浏览器，从上下文池借用上下文 (首次调用需启动浏览器，同样计入超时)
+        # shield: 超时只放弃等待，浏览器启动与上下文池创建继续完成，供后续调用使用
+        pool = await asyncio.wait_for(asyncio.shield(_get_context_pool()), deadline - time.monotonic())
+    except asyncio.TimeoutError:
+        return {"url": url, "error": f"启动浏览器超时 ({timeout}秒)", "status_code": 0}
+    except Exception as e:
+        return {"url": url, "error": str(e), "status_code": 0}
+    return await _fetch_dynamic_one(pool, url, deadline - time.monotonic(), selector)
+
+@tool_decorator(
+    name="fetch_dynamic_many",
+    description="并发获取多个客户端渲染的动态网页内容"
+)
+async def fetch_dynamic_many(urls: list, timeout: int = 10, concurrency: int = 8) -> List[Any]:
+    """
+    并发获取多个URL的动态网页内容
+    
+    Args:
+        urls: 网页URL列表
+        timeout: 单个网页的超时时间(秒)
+        concurrency: 最大并发数 (限制在 1 到上下文池大小之间)
+    
+    Returns:
+        与urls顺序一致的内容列表，失败项为错误信息字典
+    """
+    try:
+        pool = await _get_context_pool()
+    except Exception as e:
+        return [{"url": url, "error": str(e), "status_code": 0} for url in urls]
+    
+    # 并发数为0时信号量永远无法获取，负数会直接报错
+    semaphore = asyncio.Semaphore(max(1, min(concurrency, _CONTEXT_POOL_SIZE)))
+    
+    async def fetch(url):
+        async with semaphore:
+            return await _fetch_dynamic_one(pool, url, timeout)
+    
+    return await asyncio.gather(*(fetch(url) for url in urls))
 
 @tool_decorator(
     name="check_website_status",
@@ -283,20 +719,43 @@ async def fetch_dynamic_webpage(url: str, timeout: int = 10) -> str:
 )
 async def check_website_status(url: str) -> Dict[str, Any]:
     """检查网站是否可达及其状态码"""
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.head(url, allow_redirects=True) as response:
-                return {
-                    "url": url,
-                    "status_code": response.status,
-                    "content_type": response.headers.get("Content-Type"),
-                    "final_url": str(response.url)
-                }
-        except Exception as e:
-            return {"url": url, "error": str(e), "status_code": 0}
+    return await _check_cached(await _get_session(), url)
+
+@tool_decorator(
+    name="check_many_statuses",
+    description="并发检查多个网站状态"
+)
+async def check_many_statuses(urls: list) -> List[Dict[str, Any]]:
+    """并发检查多个网站是否可达及其状态码"""
+    session = await _get_session()
+    return await asyncio.gather(*(_check_cached(session, url) for url in urls))
         
 if __name__=="__main__":
-    a = asyncio.run(fetch_dynamic_webpage(url='https://www.baidu.com'))
-    # a = asyncio.run(fetch_dynamic_webpage(url='https://www.ccxi.com.cn/creditrating/result'))
-    # asyncio.run(check_website_status(url='https://www.ccxi.com.cn/creditrating/result'))
-    1
\ No newline at end of file
+    # 交互式调试: 每行输入一个命令，共享会话与浏览器在多次请求间保持预热
+    #   <url>            抓取动态网页
+    #   fetch <url>      获取静态网页
+    #   status <url>     检查网站状态
+    #   quit             退出
+    loop = asyncio.new_event_loop()
+    try:
+        while True:
+            try:
+                line = input("url> ").strip()
+            except EOFError:
+                break
+            if not line:
+                continue
+            if line in ("quit", "exit"):
+                break
+            
+            command, _, url = line.partition(" ")
+            if command == "fetch" and url:
+                coro = fetch_webpage(url=url.strip())
+            elif command == "status" and url:
+                coro = check_website_status(url=url.strip())
+            else:
+                coro = fetch_dynamic_webpage(url=line)
+            print(loop.run_until_complete(coro))
+    finally:
+        loop.run_until_complete(close_shared_resources())
+        loop.close()
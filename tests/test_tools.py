@@ -0,0 +1,266 @@
+"""
+工具系统测试 - 计算器表达式引擎、结果缓存与数据摘要
+"""
+import asyncio
+import json
+import math
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# 工具模块之间使用平级导入 (from registry import ...)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src" / "tools"))
+
+from data_tools import CalculatorTool, DataAnalyzerTool, _compile_expr, json_validator  # noqa: E402
+
+def run(coro):
+    return asyncio.run(coro)
+
+@pytest.fixture
+def calculator():
+    return CalculatorTool()
+
+# ---------- 运算符语义与Python一致 ----------
+
+PARITY_ENV = {"x": 7, "y": -3, "f": 2.5, "s": "abc", "xs": [1, 2, 3, 4], "d": {"k": 1}}
+
+@pytest.mark.parametrize("expression", [
+    "x + y", "x - y", "x * y", "x / y", "x // y", "x % y", "y // x", "y % x",
+    "x ** 2", "2 ** -1", "f ** 0.5", "-x", "+y", "~x", "not x", "not 0",
+    "x << 2", "x >> 1", "x & y", "x | y", "x ^ y",
+    "x > y", "x == 7.0", "x != y", "y < 0 <= x < 10", "1 < x > 10",
+    "x in xs", "5 not in xs", "s is s", "None is not s",
+    "0 or 'fallback'", "x and y", "x and 0 and y", "'' or 0 or []", "x or y",
+    "x if y > 0 else y", "xs[1:3]", "xs[::-1]", "xs[-1]", "s[1:]", "d['k']",
+    "(x, y)", "[x, f]", "{x, x, y}", "{'a': x, y: 'b'}", "()",
+    "abs(y) + max(xs) - min(xs)", "round(f, 0)", "divmod(x, y)", "pow(x, 2, 5)",
+    "math.sqrt(16) + math.pi", "len(s) * sum(xs)", "sorted(xs, reverse=True)",
+])
+def test_operator_parity_with_python(expression):
+    env = {**PARITY_ENV, "abs": abs, "max": max, "min": min, "round": round,
+           "divmod": divmod, "pow": pow, "math": math, "len": len, "sum": sum,
+           "sorted": sorted}
+    evaluate, _ = _compile_expr(expression)
+    expected = eval(expression, {"__builtins__": {}}, env)
+    assert evaluate(env) == expected
+    assert type(evaluate(env)) is type(expected)
+
+@pytest.mark.parametrize("expression", [
+    "0 and 1 / 0",
+    "1 or 1 / 0",
+    "1 > 2 < 1 / 0",
+    "1 if True else 1 / 0",
+])
+def test_short_circuit_skips_unevaluated_operands(expression):
+    evaluate, _ = _compile_expr(expression)
+    assert evaluate({}) == eval(expression)
+
+@pytest.mark.parametrize("expression, error", [
+    ("1 / 0", ZeroDivisionError),
+    ("undefined + 1", NameError),
+    ("'a' + 1", TypeError),
+])
+def test_errors_match_python(expression, error):
+    evaluate, _ = _compile_expr(expression)
+    with pytest.raises(error):
+        evaluate({})
+
+# ---------- 拒绝白名单以外的语法 ----------
+
+@pytest.mark.parametrize("expression", [
+    "lambda: 1",
+    "[i for i in xs]",
+    "{i: i for i in xs}",
+    "(i for i in xs)",
+    "(y := 1)",
+    "f'{x}'",
+    "max(*xs)",
+    "dict(**d)",
+    "[*xs]",
+    "{**d}",
+])
+def test_unsupported_syntax_is_rejected(expression):
+    with pytest.raises(ValueError):
+        _compile_expr(expression)
+
+@pytest.mark.parametrize("expression", ["import os", "x = 1", "del x"])
+def test_statements_are_rejected(expression):
+    with pytest.raises(SyntaxError):
+        _compile_expr(expression)
+
+def test_unknown_function_is_rejected(calculator):
+    result = run(calculator.execute(expression="open('/etc/passwd')"))
+    assert "不安全函数: open" in result["error"]
+
+def test_function_passed_as_variable_is_allowed(calculator):
+    result = run(calculator.execute(expression="double(4)", variables={"double": lambda v: v * 2}))
+    assert result["result"] == 8
+
+# ---------- 禁止访问下划线属性 ----------
+
+@pytest.mark.parametrize("expression", [
+    "(1).__class__",
+    "().__class__.__bases__[0].__subclasses__()",
+    "math.__dict__",
+    "math._private",
+    "x.real.__class__",
+])
+def test_underscore_attributes_are_blocked(expression):
+    with pytest.raises(ValueError, match="不允许访问属性"):
+        _compile_expr(expression)
+
+def test_underscore_attribute_error_is_reported(calculator):
+    result = run(calculator.execute(expression="(1).__class__"))
+    assert "不允许访问属性: __class__" in result["error"]
+
+def test_public_attributes_are_allowed(calculator):
+    result = run(calculator.execute(expression="math.floor(x.real)", variables={"x": 2.7}))
+    assert result["result"] == 2
+
+# ---------- 结果缓存 ----------
+
+def test_cache_distinguishes_arrays_with_same_repr(calculator):
+    # 大数组的repr会省略中间元素，两者的 str() 相同
+    changed = np.arange(2000)
+    changed[1000] += 999000
+    assert str(changed) == str(np.arange(2000))
+
+    first = run(calculator.safe_execute(expression="sum(x)", variables={"x": np.arange(2000)}))
+    second = run(calculator.safe_execute(expression="sum(x)", variables={"x": changed}))
+    assert first["result"]["result"] == 1999000
+    assert second["result"]["result"] == 2998000
+
+def test_uncacheable_arguments_are_not_cached(calculator):
+    run(calculator.safe_execute(expression="sum(x)", variables={"x": np.arange(10)}))
+    assert len(calculator._result_cache) == 0
+
+def test_mixed_type_dict_keys_do_not_fail(calculator):
+    result = run(calculator.safe_execute(expression="x[1]", variables={"x": {1: "a", "b": 2}}))
+    assert result["success"] is True
+    assert result["result"]["result"] == "a"
+
+def test_int_and_str_keys_get_separate_entries(calculator):
+    # 两者序列化为JSON后相同: {"x": {"1": "v"}}
+    int_key = run(calculator.safe_execute(expression="x[1]", variables={"x": {1: "v"}}))
+    str_key = run(calculator.safe_execute(expression="x[1]", variables={"x": {"1": "v"}}))
+    assert int_key["result"]["result"] == "v"
+    assert str_key["success"] is True
+    assert "error" in str_key["result"]
+
+def test_bool_and_int_arguments_get_separate_entries(calculator):
+    as_bool = run(calculator.safe_execute(expression="x", variables={"x": True}))
+    as_int = run(calculator.safe_execute(expression="x", variables={"x": 1}))
+    assert as_bool["result"]["type"] == "bool"
+    assert as_int["result"]["type"] == "int"
+
+def test_cache_hit_returns_equal_result(calculator):
+    first = run(calculator.safe_execute(expression="x * 2", variables={"x": 21}))
+    second = run(calculator.safe_execute(expression="x * 2", variables={"x": 21}))
+    assert first == second
+    assert len(calculator._result_cache) == 1
+
+def test_mutating_a_result_does_not_poison_the_cache(calculator):
+    first = run(calculator.safe_execute(expression="[x, x]", variables={"x": 1}))
+    first["result"]["result"].append("poison")
+    first["result"]["variables"]["x"] = 99
+
+    second = run(calculator.safe_execute(expression="[x, x]", variables={"x": 1}))
+    assert second["result"]["result"] == [1, 1]
+    assert second["result"]["variables"] == {"x": 1}
+
+    second["result"]["result"].clear()
+    third = run(calculator.safe_execute(expression="[x, x]", variables={"x": 1}))
+    assert third["result"]["result"] == [1, 1]
+
+def test_signed_zero_gets_separate_entries(calculator):
+    positive = run(calculator.safe_execute(expression="math.copysign(1, x)", variables={"x": 0.0}))
+    negative = run(calculator.safe_execute(expression="math.copysign(1, x)", variables={"x": -0.0}))
+    assert positive["result"]["result"] == 1.0
+    assert negative["result"]["result"] == -1.0
+
+def test_dict_order_does_not_change_the_key(calculator):
+    run(calculator.safe_execute(expression="x['a'] + x['b']", variables={"x": {"a": 1, "b": 2}}))
+    run(calculator.safe_execute(expression="x['a'] + x['b']", variables={"x": {"b": 2, "a": 1}}))
+    assert len(calculator._result_cache) == 1
+
+def test_cache_keys_do_not_hold_the_arguments(calculator):
+    run(calculator.safe_execute(expression="len(s)", variables={"s": "x" * 1_000_000}))
+    (key,) = calculator._result_cache
+    assert len(key) == 16
+
+# ---------- 记录列表摘要与pandas一致 ----------
+
+SUMMARY_PARITY_RECORDS = {
+    "ints": [{"a": 1}, {"a": 2}, {"a": 2}],
+    "ints_with_missing": [{"a": 1}, {}, {"a": None}],
+    "int64_bounds": [{"a": -2**63}, {"a": 2**63 - 1}],
+    "beyond_int64": [{"a": 2**70}, {"a": 1}],
+    "uint64_range": [{"a": 2**63}, {"a": 1}],
+    "uint64_max": [{"a": 2**64 - 1}],
+    "uint64_with_missing": [{"a": 2**63}, {}],
+    "below_int64": [{"a": -2**63 - 1}],
+    "uint64_and_negative": [{"a": 2**63}, {"a": -1}],
+    "beyond_int64_with_missing": [{"a": 2**70}, {"a": None}],
+    "beyond_int64_and_float": [{"a": 2**70}, {"a": 2.5}],
+    "uint64_and_float": [{"a": 2**63}, {"a": 2.5}],
+    "ints_and_floats": [{"a": 1}, {"a": 2.5}],
+    "nan": [{"a": float("nan")}, {"a": 1.0}],
+    "all_nan": [{"a": float("nan")}, {"a": float("nan")}],
+    "nan_and_none": [{"a": float("nan")}, {"a": None}],
+    "bools": [{"a": True}, {"a": False}],
+    "bools_with_missing": [{"a": True}, {"a": None}],
+    "bools_and_ints": [{"a": True}, {"a": 1}],
+    "strings": [{"a": "x"}, {"a": "y"}, {"a": "x"}],
+    "strings_with_missing": [{"a": "x"}, {}],
+    "strings_and_ints": [{"a": "x"}, {"a": 1}],
+    "all_missing": [{"a": None}, {"a": None}],
+    "ragged_columns": [{"a": 1, "b": "x"}, {"c": 2.5}, {"b": None, "a": 3}],
+}
+
+@pytest.mark.parametrize("records", SUMMARY_PARITY_RECORDS.values(), ids=SUMMARY_PARITY_RECORDS.keys())
+def test_record_summary_matches_dataframe(records):
+    tool = DataAnalyzerTool()
+    result = run(tool.execute(data=json.dumps(records), analysis_type="summary"))
+    expected_df = pd.DataFrame(records)
+    assert result["columns"] == list(expected_df.columns)
+    assert result["result"] == tool._get_summary(expected_df)
+
+@pytest.mark.parametrize("records, fast_path", [
+    ([{"a": 2**63 - 1}], True),
+    ([{"a": -2**63}], True),
+    ([{"a": 2**63}], False),
+    ([{"a": -2**63 - 1}], False),
+    ([{"a": 1, "b": 2**70}], False),
+])
+def test_record_summary_falls_back_outside_int64(records, fast_path):
+    assert (DataAnalyzerTool()._summarize_records(records) is not None) is fast_path
+
+# ---------- JSON校验不受大整数回退路径影响 ----------
+
+@pytest.mark.parametrize("text", [
+    '{"x": NaN}',
+    '{"id": "1234567890123456789", "x": NaN}',
+    '{"id": 12345678901234567890, "x": Infinity}',
+    '[1234567890123456789, -Infinity]',
+])
+def test_json_validator_rejects_non_finite_constants(text):
+    result = run(json_validator(json_str=text))
+    assert result["valid"] is False
+    assert text[result["position"]:].lstrip("-").startswith(("NaN", "Infinity"))
+
+@pytest.mark.parametrize("text", [
+    '[1e400]',
+    '[1e400, 12345678901234567890]',
+    '"\\ud800"',
+    '["\\ud800", 12345678901234567890]',
+])
+def test_json_validator_rejects_what_orjson_rejects_on_both_paths(text):
+    assert run(json_validator(json_str=text))["valid"] is False
+
+def test_json_validator_keeps_constant_names_inside_strings():
+    result = run(json_validator(json_str='{"id": 12345678901234567890, "x": "NaN"}', pretty_print=False))
+    assert result["valid"] is True
+    assert result["formatted"] == '{"id":12345678901234567890,"x":"NaN"}'